@@ -0,0 +1,41 @@
+# Throughput of `phone_field.vectorized.normalize()` vs. mapping `PhoneNumber` over a pandas Series.
+#
+#   python benchmarks/bench_vectorized.py [rows]
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from phone_field import PhoneNumber  # noqa: E402
+from phone_field.vectorized import normalize  # noqa: E402
+from benchmarks.corpus import generate  # noqa: E402
+
+
+def make_series(rows, seed=0):
+    return pd.Series(list(generate(rows, seed=seed)))
+
+
+def scalar(series):
+    phones = series.map(PhoneNumber)
+    return pd.DataFrame({
+        'cleaned': phones.map(lambda ph: ph.cleaned),
+        'formatted': phones.map(lambda ph: ph.formatted),
+        'is_E164': phones.map(lambda ph: ph.is_E164),
+        'is_usa': phones.map(lambda ph: ph.is_usa),
+    })
+
+
+def timed(func, series):
+    start = time.perf_counter()
+    func(series)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    series = make_series(rows)
+    for label, func in (('PhoneNumber per row', scalar), ('vectorized', normalize)):
+        elapsed = timed(func, series)
+        print('{:<20} {:>8.3f}s {:>12,.0f} rows/s'.format(label, elapsed, rows / elapsed))
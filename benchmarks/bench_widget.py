@@ -0,0 +1,91 @@
+# Time to render a `inlineformset_factory(Business, Employee)` formset, which renders one PhoneWidget per row, with
+# the current PhoneWidget and with a copy of the 1.8.1 one (BaselinePhoneWidget). Rows alternate between empty and
+# filled phones at `--empty-rate`. Uses the models and settings of test_proj.
+#
+#   python benchmarks/bench_widget.py [--rows N] [--repeat N] [--empty-rate R]
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'test_proj'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_proj.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django import forms  # noqa: E402
+from django.forms import inlineformset_factory  # noqa: E402
+from phone_field import PhoneNumber, PhoneWidget  # noqa: E402
+from phone_field.phone_number import BACKEND_EXTENSION_SEPARATOR  # noqa: E402
+from test_app.models import Business, Employee  # noqa: E402
+
+
+class BaselinePhoneWidget(PhoneWidget):
+    # decompress() and get_context() as of 1.8.1
+    def decompress(self, value):
+        if not isinstance(value, PhoneNumber):
+            value = PhoneNumber(value)
+        return value.base_number_fmt, BACKEND_EXTENSION_SEPARATOR.join(value.extensions)
+
+    def get_context(self, name, value, attrs):
+        self.widgets[0].is_required = attrs.get('required', False)
+        ctx = forms.MultiWidget.get_context(self, name, value, attrs)
+        ctx['widget']['subwidgets'][1]['attrs']['required'] = False
+        return ctx
+
+
+WIDGETS = {
+    'baseline': BaselinePhoneWidget,
+    'current': PhoneWidget,
+}
+
+
+def make_formset(rows, widget, empty_rate=0.5):
+    business = Business(pk=1, name='Some Business')
+    FormSet = inlineformset_factory(Business, Employee, fields=('name', 'phone'), extra=0,
+                                    widgets={'phone': widget()})
+    formset = FormSet(instance=business, queryset=Employee.objects.none())
+    # Bind unsaved employees as the formset's initial objects, so no database is needed. Every `1 / empty_rate`th
+    # row has an empty phone, so the result doesn't depend on a random seed.
+    step = round(1 / empty_rate) if empty_rate else 0
+    employees = [
+        Employee(pk=i, name=str(i), business=business,
+                 phone='' if step and i % step == 0 else PhoneNumber('+1415{:07d}x{}'.format(i, i % 10)))
+        for i in range(rows)
+    ]
+    formset._queryset = employees
+    formset.get_queryset = lambda: employees
+    return formset
+
+
+def render(rows, widget, empty_rate):
+    return str(make_formset(rows, widget, empty_rate))
+
+
+def render_phones(rows, widget, empty_rate):
+    return ''.join(str(form['phone']) for form in make_formset(rows, widget, empty_rate))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare PhoneWidget rendering with the 1.8.1 widget.')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--empty-rate', type=float, default=0.5)
+    args = parser.parse_args()
+
+    for label, func in (('formset', render), ('phone fields only', render_phones)):
+        for name, widget in WIDGETS.items():
+            assert func(10, widget, args.empty_rate) == func(10, WIDGETS['baseline'], args.empty_rate)
+        # Alternate between the widgets, so drift on a noisy machine affects both alike
+        best = dict.fromkeys(WIDGETS, float('inf'))
+        for _ in range(args.repeat):
+            for name, widget in WIDGETS.items():
+                elapsed = timeit.timeit(lambda: func(args.rows, widget, args.empty_rate), number=1)
+                best[name] = min(best[name], elapsed)
+        for name, elapsed in best.items():
+            print('{:<18} {:<9} {} rows: {:.3f}s per render ({:.3f}ms per row)'.format(
+                label, name, args.rows, elapsed, elapsed * 1000 / args.rows))
@@ -0,0 +1,132 @@
+# Deterministic generator of realistic, messy phone number inputs for benchmarks and fuzzing. The shapes mirror what
+# PhoneNumber handles in the wild: "+1-" prefixes, parentheses, dots, stray whitespace, "x" and ", press "
+# extensions, international numbers and plain garbage. Values are repeated at a controllable rate, as they are in
+# real tables.
+#
+#   python benchmarks/corpus.py OUT ROWS [--seed N] [--duplicate-rate R]
+#
+# The output has one JSON string per line, so any character survives the round trip (see read_corpus()).
+import argparse
+import json
+import random
+
+
+def _area(rng):
+    return '{}{:02d}'.format(rng.randint(2, 9), rng.randint(0, 99))
+
+
+def _local(rng):
+    return '{:03d}'.format(rng.randint(100, 999)), '{:04d}'.format(rng.randint(0, 9999))
+
+
+def _ws(rng):
+    return rng.choice(['', ' ', '  ', '\t', ' '])
+
+
+def _sep(rng):
+    return rng.choice(['', ' ', '-', '.', ' - ', '. '])
+
+
+def us_number(rng):
+    area, (exchange, line) = _area(rng), _local(rng)
+    prefix = rng.choice(['', '', '', '1', '1 ', '+1', '+1 ', '+1-', '1-'])
+    if rng.random() < 0.4:
+        area = '({})'.format(area) + rng.choice(['', ' '])
+        return _ws(rng) + prefix + area + exchange + _sep(rng) + line + _ws(rng)
+    return _ws(rng) + prefix + area + _sep(rng) + exchange + _sep(rng) + line + _ws(rng)
+
+
+def with_extension(rng):
+    extensions = [str(rng.randint(1, 9999)) for _ in range(rng.choice([1, 1, 1, 2]))]
+    if rng.random() < 0.5:
+        return us_number(rng).rstrip() + ', press ' + ', press '.join(extensions)
+    sep = rng.choice(['x', ' x ', 'x ', ' x'])
+    return us_number(rng).rstrip() + sep + sep.join(extensions)
+
+
+def bad_extension(rng):
+    return us_number(rng).rstrip() + rng.choice([' x ', ', press ']) + rng.choice(['abc', '12#', '', ' ', '1x'])
+
+
+def international(rng):
+    return rng.choice([
+        '+44 20 {} {}'.format(rng.randint(1000, 9999), rng.randint(1000, 9999)),
+        '+44 (0)20-{}-{}'.format(rng.randint(1000, 9999), rng.randint(1000, 9999)),
+        '+91-{}-{}'.format(rng.randint(10000, 99999), rng.randint(10000, 99999)),
+        '0049 30 {}'.format(rng.randint(1000000, 9999999)),
+        '+33 1 {:02d} {:02d} {:02d} {:02d}'.format(*(rng.randint(0, 99) for _ in range(4))),
+    ])
+
+
+def garbage(rng):
+    return rng.choice([
+        '', ' ', 'n/a', 'N/A', 'none', 'call me', 'unknown', '-', '0', '555-1234', '123', '1234567890',
+        '(015) 123-4567', '415 123 456', '415 123 45678', '+1 (415) 123-4567 ext. 5', 'xxx', ', press ',
+        ''.join(rng.choice('0123456789()-.+x ') for _ in range(rng.randint(1, 20))),
+    ])
+
+
+def unicode_digits(rng):
+    # Full-width and Arabic-Indic digits, as pasted from other systems
+    offset = rng.choice([0xFF10, 0x0660])
+    return ''.join(chr(offset + int(c)) if c.isdigit() else c for c in us_number(rng))
+
+
+SHAPES = {
+    'us_number': (us_number, 60),
+    'with_extension': (with_extension, 12),
+    'bad_extension': (bad_extension, 3),
+    'international': (international, 10),
+    'garbage': (garbage, 13),
+    'unicode_digits': (unicode_digits, 2),
+}
+
+
+def generate(rows, seed=0, duplicate_rate=0.2, shapes=None, pool_size=10000):
+    # Yield `rows` inputs. The same arguments always produce the same sequence. With probability `duplicate_rate` a
+    # value is repeated from the last `pool_size` distinct values instead of being generated. `shapes` maps shape
+    # names (see SHAPES) to relative weights.
+    rng = random.Random(seed)
+    weights = shapes or {name: weight for name, (func, weight) in SHAPES.items()}
+    funcs = [SHAPES[name][0] for name in weights]
+    cum_weights = []
+    total = 0
+    for weight in weights.values():
+        total += weight
+        cum_weights.append(total)
+
+    pool = []
+    for _ in range(rows):
+        if pool and rng.random() < duplicate_rate:
+            yield rng.choice(pool)
+            continue
+        value = rng.choices(funcs, cum_weights=cum_weights)[0](rng)
+        if len(pool) < pool_size:
+            pool.append(value)
+        else:
+            pool[rng.randrange(pool_size)] = value
+        yield value
+
+
+def write_corpus(path, rows, **kwargs):
+    # Stream generate(rows, **kwargs) to `path` without holding it in memory
+    with open(path, 'w', encoding='utf-8') as f:
+        for value in generate(rows, **kwargs):
+            f.write(json.dumps(value))
+            f.write('\n')
+
+
+def read_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic phone number corpus.')
+    parser.add_argument('out')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    args = parser.parse_args()
+    write_corpus(args.out, args.rows, seed=args.seed, duplicate_rate=args.duplicate_rate)
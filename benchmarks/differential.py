@@ -0,0 +1,120 @@
+# Differential harness: runs an alternative parse path over a corpus, checks every result against PhoneNumber, and
+# reports the throughput of both.
+#
+#   python benchmarks/differential.py [--path vectorized|batch] [--rows N] [--seed N] [--corpus FILE]
+#
+# An alternative path is a callable that takes a list of raw values and returns one mapping per value, keyed by
+# PhoneNumber attribute names (e.g. {'cleaned': ..., 'is_E164': ...}). Only the attributes it returns are compared,
+# but returning the wrong number of rows, or a row without any of ATTRIBUTES, counts as a mismatch.
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from phone_field.phone_number import PhoneNumber, parse_phone_numbers  # noqa: E402
+
+try:
+    from benchmarks.corpus import generate, read_corpus
+except ImportError:  # Run as a script from this directory
+    from corpus import generate, read_corpus
+
+
+ATTRIBUTES = ('cleaned', 'formatted', 'base_number', 'base_number_fmt', 'is_E164', 'is_standard', 'is_usa')
+
+
+def scalar_path(values):
+    return [{attr: getattr(ph, attr) for attr in ATTRIBUTES} for ph in map(PhoneNumber, values)]
+
+
+def batch_path(values):
+    return [{attr: getattr(ph, attr) for attr in ATTRIBUTES} for ph in parse_phone_numbers(values)]
+
+
+def vectorized_path(values):
+    from phone_field.vectorized import normalize_arrow
+    return normalize_arrow(values).to_pylist()
+
+
+PATHS = {
+    'batch': batch_path,
+    'vectorized': vectorized_path,
+}
+
+
+class Report:
+    def __init__(self):
+        self.rows = 0
+        self.mismatches = 0
+        self.examples = []  # (value, attribute, expected, actual)
+        self.reference_time = 0.0
+        self.candidate_time = 0.0
+
+    def throughput(self, elapsed):
+        return self.rows / elapsed if elapsed else float('inf')
+
+    def __str__(self):
+        lines = [
+            'rows:        {:,}'.format(self.rows),
+            'mismatches:  {:,}'.format(self.mismatches),
+            'PhoneNumber: {:>12,.0f} rows/s'.format(self.throughput(self.reference_time)),
+            'candidate:   {:>12,.0f} rows/s'.format(self.throughput(self.candidate_time)),
+        ]
+        lines.extend('  {!r}: {} expected {!r}, got {!r}'.format(*example) for example in self.examples)
+        return '\n'.join(lines)
+
+
+def check(candidate, values, chunk_size=100000, max_examples=20):
+    # Compare `candidate` with PhoneNumber over `values` (any iterable, consumed `chunk_size` at a time)
+    report = Report()
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            break
+
+        start = time.perf_counter()
+        expected = scalar_path(chunk)
+        report.reference_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = list(candidate(chunk))
+        report.candidate_time += time.perf_counter() - start
+
+        if len(actual) != len(chunk):
+            # Results can't be matched to inputs, so every row counts as a mismatch
+            report.mismatches += len(chunk)
+            if len(report.examples) < max_examples:
+                report.examples.append((chunk[0], '<rows>', len(chunk), len(actual)))
+            report.rows += len(chunk)
+            continue
+
+        for value, exp, act in zip(chunk, expected, actual):
+            attrs = act.keys() & exp.keys()
+            if not attrs:
+                # Nothing to compare, e.g. misspelled attribute names
+                report.mismatches += 1
+                if len(report.examples) < max_examples:
+                    report.examples.append((value, '<attributes>', sorted(ATTRIBUTES), sorted(act.keys())))
+            for attr in attrs:
+                if act[attr] != exp[attr]:
+                    report.mismatches += 1
+                    if len(report.examples) < max_examples:
+                        report.examples.append((value, attr, exp[attr], act[attr]))
+        report.rows += len(chunk)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check an alternative parse path against PhoneNumber.')
+    parser.add_argument('--path', choices=sorted(PATHS), default='vectorized')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', help='Corpus file written by corpus.py (overrides --rows and --seed)')
+    args = parser.parse_args()
+
+    values = read_corpus(args.corpus) if args.corpus else generate(args.rows, seed=args.seed)
+    report = check(PATHS[args.path], values)
+    print(report)
+    sys.exit(1 if report.mismatches else 0)
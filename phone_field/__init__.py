@@ -1,3 +1,3 @@
 from .phone_number import PhoneNumber
-from .models import PhoneField
+from .models import PhoneField, PhoneArrayField
 from .forms import PhoneFormField, PhoneWidget
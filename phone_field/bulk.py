@@ -0,0 +1,204 @@
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.validators import MaxLengthValidator
+from django.db import connections, router, transaction
+from django.db.models import NOT_PROVIDED
+from .managers import invalidate_lookup_cache
+from .models import PhoneField
+from .phone_number import parse_phone_numbers
+
+
+class RowError:
+    def __init__(self, index, row, errors):
+        self.index = index    # Position of the row in the input
+        self.row = row
+        self.errors = errors  # {field name: [messages]}
+
+    def __repr__(self):
+        return '<RowError {}: {}>'.format(self.index, self.errors)
+
+
+class BulkValidationResult:
+    def __init__(self, valid, rejected):
+        self.valid = valid        # Rows that passed, with their phone values replaced by parsed PhoneNumbers
+        self.rejected = rejected  # RowErrors, in input order
+
+    @property
+    def errors(self):
+        return {r.index: r.errors for r in self.rejected}
+
+
+class BulkUpsertResult:
+    def __init__(self, inserted, updated, duplicates, rejected):
+        self.inserted = inserted      # Number of new rows
+        self.updated = updated        # Number of existing rows that were updated
+        self.duplicates = duplicates  # Number of input rows superseded by a later row with the same number
+        self.rejected = rejected      # RowErrors, in input order
+
+    def __repr__(self):
+        return '<BulkUpsertResult inserted={} updated={} duplicates={} rejected={}>'.format(
+            self.inserted, self.updated, self.duplicates, len(self.rejected))
+
+
+def _phone_fields(model, fields):
+    if fields is None:
+        return [f for f in model._meta.concrete_fields if isinstance(f, PhoneField)]
+    return [model._meta.get_field(name) for name in fields]
+
+
+def _get(row, field):
+    if isinstance(row, dict):
+        return row.get(field.name)
+    return getattr(row, field.attname)
+
+
+def _set(row, field, value):
+    if isinstance(row, dict):
+        row[field.name] = value
+    else:
+        setattr(row, field.attname, value)
+
+
+def _field_errors(field, phone):
+    # The checks full_clean() and PhoneFormField would run for one value, minus the rest of the model
+    if not phone:
+        if not field.blank:
+            return [field.error_messages['blank']]
+        return []
+
+    errors = []
+    if field.max_length is not None and len(phone) > field.max_length:
+        errors.append('Phone number is too long.')
+    for validator in field.validators:
+        if isinstance(validator, MaxLengthValidator):
+            continue
+        try:
+            validator(phone)
+        except ValidationError as e:
+            errors.extend(e.messages)
+    return errors
+
+
+def validate_phones(model, rows, fields=None):
+    # Normalize and validate the PhoneField values of `rows` (model instances or dicts keyed by field name) in one
+    # batch, e.g. ahead of `bulk_create()`, which skips `full_clean()`. Only the phone fields are checked: `fields`
+    # defaults to every PhoneField on `model`. Values are replaced in place with parsed PhoneNumbers.
+    rows = list(rows)
+    phone_fields = _phone_fields(model, fields)
+    errors = [{} for _ in rows]
+
+    for field in phone_fields:
+        values = [_get(row, field) for row in rows]
+        for row, value, phone, row_errors in zip(rows, values, parse_phone_numbers(values), errors):
+            if value is not None:
+                _set(row, field, phone)
+            field_errors = _field_errors(field, phone)
+            if field_errors:
+                row_errors[field.name] = field_errors
+
+    valid, rejected = [], []
+    for index, (row, row_errors) in enumerate(zip(rows, errors)):
+        if row_errors:
+            rejected.append(RowError(index, row, row_errors))
+        else:
+            valid.append(row)
+    return BulkValidationResult(valid, rejected)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _required_fields(model):
+    # Fields an INSERT can't leave out: NOT NULL without a Python or database default
+    return [
+        f for f in model._meta.concrete_fields
+        if not f.null and not f.primary_key and f.get_default() is None
+        and getattr(f, 'db_default', NOT_PROVIDED) is NOT_PROVIDED
+    ]
+
+
+def bulk_upsert(model, rows, phone_field='phone', update_fields=None, batch_size=1000, using=None):
+    # Insert or update `rows` (model instances or dicts keyed by field name), matching on the unique PhoneField
+    # `phone_field`. All numbers are normalized and validated in one batch (see validate_phones()), and only the last
+    # row for each number is kept. Dict rows must all have the same keys; rows that don't are rejected, so a missing
+    # key never overwrites existing data with the field's default. `update_fields` defaults to those keys, or to every
+    # concrete field for instances. Existing numbers are updated with bulk_update(), which only writes
+    # `update_fields`. New numbers are inserted with bulk_create(), using `update_conflicts=True` where the database
+    # supports it, in case they were inserted concurrently. New rows without a value for a NOT NULL field that has no
+    # default are rejected. The inserted/updated counts come from a SELECT made just before writing, so they're
+    # best-effort: a number inserted concurrently in between is counted as inserted, although it's updated.
+    field = model._meta.get_field(phone_field)
+    rows = list(rows)
+    result = validate_phones(model, rows, fields=[phone_field])
+    rejected = result.rejected
+
+    by_number = {}
+    keys = None
+    for index, row in enumerate(rows):
+        if index in result.errors:
+            continue
+        phone = _get(row, field)
+        if not phone:
+            rejected.append(RowError(index, row, {field.name: [field.error_messages['blank']]}))
+            continue
+        if isinstance(row, dict):
+            if keys is None:
+                keys = set(row)
+            elif set(row) != keys:
+                rejected.append(RowError(index, row, {NON_FIELD_ERRORS: [
+                    'Row has different fields from the first row ({}).'.format(', '.join(sorted(keys)))
+                ]}))
+                continue
+        by_number[phone.cleaned] = index, row
+    duplicates = len(rows) - len(rejected) - len(by_number)
+
+    if update_fields is None:
+        if keys is not None:
+            update_fields = sorted(keys)
+        else:
+            update_fields = [f.name for f in model._meta.concrete_fields]
+    elif keys is not None and not keys.issuperset(update_fields):
+        raise ValueError('update_fields {} are missing from the rows.'.format(sorted(set(update_fields) - keys)))
+    update_fields = [name for name in update_fields
+                     if name != field.name and not model._meta.get_field(name).primary_key]
+    objs = [(index, row, model(**row) if isinstance(row, dict) else row) for index, row in by_number.values()]
+    required = _required_fields(model)
+
+    using = using or router.db_for_write(model)
+    manager = model._base_manager.db_manager(using)
+
+    with transaction.atomic(using=using):
+        # One query per chunk to tell inserts from updates
+        existing = {}
+        numbers = [_get(obj, field) for index, row, obj in objs]
+        for chunk in _chunks(numbers, batch_size):
+            for number, pk in manager.filter(**{field.name + '__in': chunk}).values_list(field.name, 'pk'):
+                existing[number.cleaned] = pk
+
+        new, updated = [], []
+        for index, row, obj in objs:
+            if _get(obj, field).cleaned in existing:
+                updated.append(obj)
+                continue
+            # Rows that only update some fields are fine for existing numbers, but would fail the whole INSERT
+            missing = [f for f in required if getattr(obj, f.attname) is None]
+            if missing:
+                rejected.append(RowError(index, row, {f.name: [f.error_messages['null']] for f in missing}))
+            else:
+                new.append(obj)
+
+        if connections[using].features.supports_update_conflicts_with_target and update_fields:
+            for chunk in _chunks(new, batch_size):
+                manager.bulk_create(chunk, update_conflicts=True, unique_fields=[field.name],
+                                    update_fields=update_fields)
+        else:
+            manager.bulk_create(new, batch_size=batch_size)
+        for obj in updated:
+            obj.pk = existing[_get(obj, field).cleaned]
+        if update_fields:
+            manager.bulk_update(updated, update_fields, batch_size=batch_size)
+    invalidate_lookup_cache(model, using=using)
+
+    rejected.sort(key=lambda r: r.index)
+    return BulkUpsertResult(len(new), len(updated), duplicates, rejected)
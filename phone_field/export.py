@@ -0,0 +1,116 @@
+import csv
+import json
+from itertools import islice
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.http import StreamingHttpResponse
+from django.views.generic import View
+from django.views.generic.list import MultipleObjectMixin
+from .models import PhoneField
+from .phone_number import PhoneNumber, parse_phone_numbers
+
+
+DEFAULT_PHONE_ATTRS = ('formatted',)
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    # File-like object for csv.writer that hands back each line instead of buffering it
+    def write(self, value):
+        return value
+
+
+def _is_phone_field(model, path):
+    # Follow "a__b__c" field paths through relations to find the final model field
+    field = None
+    for name in path.split(LOOKUP_SEP):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        if field.is_relation:
+            model = field.related_model
+    return isinstance(field, PhoneField)
+
+
+def _format_phones(values, phone_attrs):
+    # Values come from PhoneField.from_db_value(), so they're either None or PhoneNumbers that haven't been parsed
+    # yet. Parsing by raw value lets repeated numbers within a batch share the work. None becomes an empty
+    # PhoneNumber, so each column keeps one type (e.g. is_E164 is False rather than '').
+    raw = [v.raw_phone if isinstance(v, PhoneNumber) else v for v in values]
+    return [tuple(getattr(ph, attr) for attr in phone_attrs) for ph in parse_phone_numbers(raw)]
+
+
+def export_rows(queryset, fields, phone_attrs=DEFAULT_PHONE_ATTRS, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yield a header row and then one tuple per object in `queryset`, without instantiating any models. PhoneField
+    # columns are expanded into one "<field>_<attr>" column per PhoneNumber attribute in `phone_attrs` (e.g.
+    # 'formatted', 'cleaned', 'is_E164'). Only `chunk_size` rows are held in memory at any time.
+    phone_columns = {i for i, name in enumerate(fields) if _is_phone_field(queryset.model, name)}
+
+    header = []
+    for i, name in enumerate(fields):
+        if i in phone_columns:
+            header.extend('{}_{}'.format(name, attr) for attr in phone_attrs)
+        else:
+            header.append(name)
+    yield tuple(header)
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        formatted = {i: _format_phones([row[i] for row in chunk], phone_attrs) for i in phone_columns}
+        for n, row in enumerate(chunk):
+            out = []
+            for i, value in enumerate(row):
+                if i in formatted:
+                    out.extend(formatted[i][n])
+                else:
+                    out.append(value)
+            yield tuple(out)
+
+
+def stream_csv(queryset, fields, **kwargs):
+    # Yield the output of export_rows() as CSV lines
+    writer = csv.writer(_Echo())
+    for row in export_rows(queryset, fields, **kwargs):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(queryset, fields, **kwargs):
+    # Yield the output of export_rows() as newline-delimited JSON objects
+    rows = export_rows(queryset, fields, **kwargs)
+    header = next(rows)
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), default=str) + '\n'
+
+
+class PhoneExportView(MultipleObjectMixin, View):
+    # Streams `get_queryset()` as CSV or NDJSON. Set `model` or `queryset` and `fields`, as for a ListView.
+    fields = None
+    phone_attrs = DEFAULT_PHONE_ATTRS
+    chunk_size = DEFAULT_CHUNK_SIZE
+    export_format = 'csv'
+    filename = None
+
+    formats = {
+        'csv': (stream_csv, 'text/csv'),
+        'ndjson': (stream_ndjson, 'application/x-ndjson'),
+    }
+
+    def get_fields(self):
+        if self.fields is None:
+            return [f.name for f in self.get_queryset().model._meta.concrete_fields]
+        return self.fields
+
+    def get(self, request, *args, **kwargs):
+        stream, content_type = self.formats[self.export_format]
+        response = StreamingHttpResponse(
+            stream(self.get_queryset(), self.get_fields(), phone_attrs=self.phone_attrs, chunk_size=self.chunk_size),
+            content_type=content_type
+        )
+        if self.filename:
+            response['Content-Disposition'] = 'attachment; filename="{}"'.format(self.filename)
+        return response
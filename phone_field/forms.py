@@ -1,14 +1,32 @@
 from django import forms
-from .phone_number import PhoneNumber, BACKEND_EXTENSION_SEPARATOR
+from .phone_number import PhoneNumber, BACKEND_EXTENSION_SEPARATOR, PHONE_TEST_REGEX
+
+
+E164_ONLY_ERROR = 'Only E164 numbers are supported here (+12223334444).'
+
+# PHONE_TEST_REGEX as an HTML `pattern` attribute: browsers anchor it themselves and compile it with the "v" flag,
+# which requires a literal "-" in a character class to be escaped. JavaScript's "\d" only matches ASCII digits, so
+# it's spelled "\p{Nd}" to accept the same full-width and Arabic-Indic digits as Python's. Surrounding whitespace is
+# stripped server-side. JavaScript's "\s" differs from Python's in a few control and zero-width characters.
+PHONE_HTML_PATTERN = r'\s*(?:{})\s*'.format(
+    PHONE_TEST_REGEX.pattern[1:-1].replace('[-', r'[\-').replace(r'\d', r'\p{Nd}')
+)
 
 
 class PhoneWidget(forms.MultiWidget):
     template_name = r'phone_field/phone_widget.html'
 
-    def __init__(self, attrs={}, phone_attrs=None, ext_attrs=None):   
+    def __init__(self, attrs={}, phone_attrs=None, ext_attrs=None, client_side=False):
+        # `client_side=True` adds the phone_widget.js asset, which formats numbers as they're typed, and validation
+        # attributes that mirror the server-side rules so most invalid input is caught before submitting.
+        self.client_side = client_side
+        self.E164_only = False
         def_phone_attrs = {'size': 13}
-        def_phone_attrs.update(phone_attrs or attrs)
         def_ext_attrs = {'size': 4}
+        if client_side:
+            def_phone_attrs.update({'inputmode': 'tel', 'data-phone-field': 'phone'})
+            def_ext_attrs.update({'inputmode': 'numeric', 'data-phone-field': 'extension'})
+        def_phone_attrs.update(phone_attrs or attrs)
         def_ext_attrs.update(ext_attrs or attrs)
         widgets = (
             forms.TextInput(def_phone_attrs),
@@ -16,28 +34,44 @@ class PhoneWidget(forms.MultiWidget):
         )
         super().__init__(widgets, attrs=attrs)
 
+    def _get_media(self):
+        media = super()._get_media()
+        if self.client_side:
+            media += forms.Media(js=['phone_field/phone_widget.js'])
+        return media
+    media = property(_get_media)
+
     def decompress(self, value):
+        # Empty values don't need a PhoneNumber
+        if not value:
+            return '', ''
         if not isinstance(value, PhoneNumber):
             value = PhoneNumber(value)
         return value.base_number_fmt, BACKEND_EXTENSION_SEPARATOR.join(value.extensions)
 
     def get_context(self, name, value, attrs):
-        # First sub-widget doesn't get marked as required for some reason
-        self.widgets[0].is_required = attrs.get('required', False)
         ctx = super().get_context(name, value, attrs)
+        phone_ctx, ext_ctx = ctx['widget']['subwidgets']
 
         # `get_context()` blindly copies the "required" HTML attribute from PhoneFormField to all of the sub-widget
-        # attrs. This is the opposite of the above problem, where "required" doesn't get set in the context.
-        # The text input for phone extension should always be optional. Not sure why Django isn't taking care of this.
-        ctx['widget']['subwidgets'][1]['attrs']['required'] = False
+        # attrs. The text input for phone extension should always be optional. Not sure why Django isn't taking care
+        # of this.
+        ext_ctx['attrs']['required'] = False
+
+        if self.client_side and self.E164_only:
+            # E164 numbers can't have extensions, so the extension input has to be left empty
+            phone_ctx['attrs']['pattern'] = PHONE_HTML_PATTERN
+            for sub_ctx in (phone_ctx, ext_ctx):
+                sub_ctx['attrs'].update({'data-e164-only': True, 'data-error-message': E164_ONLY_ERROR})
         return ctx
 
 
 class PhoneFormField(forms.MultiValueField):
     widget = PhoneWidget
 
-    def __init__(self, *, require_all_fields=False, **kwargs):
+    def __init__(self, *, require_all_fields=False, E164_only=False, **kwargs):
         self.max_length = kwargs.pop('max_length', None)
+        self.E164_only = E164_only
 
         # Disregard 'empty_value' kwarg from CharField model defaults
         kwargs.pop('empty_value', None)
@@ -47,6 +81,7 @@ class PhoneFormField(forms.MultiValueField):
             forms.CharField(required=False)
         )
         super().__init__(fields, require_all_fields=require_all_fields, **kwargs)
+        self.widget.E164_only = E164_only
 
     def compress(self, data_list):
         # A completely empty widget short-circuits normal validation and returns []
@@ -59,3 +94,21 @@ class PhoneFormField(forms.MultiValueField):
     def validate(self, value):
         if self.max_length is not None and value and len(value) > self.max_length:
             raise forms.ValidationError('Phone number is too long.')
+        if self.E164_only and value and not value.is_E164:
+            raise forms.ValidationError(E164_ONLY_ERROR)
+
+
+class PhoneArrayFormField(forms.CharField):
+    # One phone number per line
+    widget = forms.Textarea(attrs={'rows': 3})
+
+    def prepare_value(self, value):
+        if isinstance(value, (list, tuple)):
+            return '\n'.join(str(x) if isinstance(x, PhoneNumber) else str(PhoneNumber(x)) for x in value)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, (list, tuple)):
+            return [x if isinstance(x, PhoneNumber) else PhoneNumber(x) for x in value]
+        value = super().to_python(value)
+        return [PhoneNumber(line) for line in value.splitlines() if line.strip()]
@@ -0,0 +1,209 @@
+import copy
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.core.cache import caches
+from django.db import connections, models, router, transaction
+from django.db.models.query import ModelIterable
+from django.db.models.signals import class_prepared, post_delete, post_save
+from .models import PhoneField
+from .phone_number import PhoneNumber
+
+
+# Lookup caches by concrete model, so that proxies share them and QuerySet.update() can invalidate them
+_lookup_caches = {}
+
+
+class PhoneLookupCache:
+    # Two-level cache of model instances by (normalized) phone number: an in-process LRU in front of a Django cache
+    # backend. Entries are never deleted one by one. Any change to the table switches to a new version, which all
+    # cache keys include. Other processes pick up a new version within `local_timeout` seconds. Changes in this
+    # process are picked up immediately.
+
+    def __init__(self, model, field_name, maxsize=1024, timeout=300, local_timeout=1.0, cache_alias='default'):
+        self.model = model
+        self.field_name = field_name
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self.cache_alias = cache_alias
+        self.key_prefix = 'phone_field.lookup.{}.{}'.format(model._meta.label_lower, field_name)
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0
+        self.reset_stats()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def reset_stats(self):
+        self.local_hits = self.cache_hits = self.misses = self.invalidations = 0
+
+    @property
+    def stats(self):
+        lookups = self.local_hits + self.cache_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'cache_hits': self.cache_hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': (self.local_hits + self.cache_hits) / lookups if lookups else 0.0,
+        }
+
+    def _current_version(self):
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked > self.local_timeout:
+            key = self.key_prefix + '.version'
+            version = self.cache.get(key)
+            if version is None:
+                self.cache.add(key, uuid.uuid4().hex, None)
+                version = self.cache.get(key)
+            self._version = version
+            self._version_checked = now
+        return self._version
+
+    def get(self, queryset, number):
+        if not isinstance(number, PhoneNumber):
+            number = PhoneNumber(number)
+        version = self._current_version()
+        local_key = (version, number.cleaned)
+
+        with self._lock:
+            obj = self._lru.get(local_key)
+            if obj is not None:
+                self._lru.move_to_end(local_key)
+                self.local_hits += 1
+                return copy.copy(obj)
+
+        key = '{}.{}.{}'.format(self.key_prefix, version, hashlib.md5(number.cleaned.encode()).hexdigest())
+        obj = self.cache.get(key)
+        if obj is not None:
+            self.cache_hits += 1
+        else:
+            obj = queryset.get(**{self.field_name: number})
+            self.misses += 1
+            self.cache.set(key, obj, self.timeout)
+
+        with self._lock:
+            self._lru[local_key] = obj
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+        return copy.copy(obj)
+
+    def _switch_version(self):
+        self.cache.set(self.key_prefix + '.version', uuid.uuid4().hex, None)
+        with self._lock:
+            self._lru.clear()
+            self._version = None
+        self.invalidations += 1
+
+    def invalidate(self, using=None):
+        # Signals and QuerySet.update() run before the transaction commits, so a concurrent get_by_phone() can still
+        # cache the old row under the new version. Switching versions again on commit drops it.
+        self._switch_version()
+        using = using or router.db_for_write(self.model)
+        if connections[using].in_atomic_block:
+            transaction.on_commit(self._switch_version, using=using)
+
+
+def invalidate_lookup_cache(model, using=None):
+    # For writes that don't send signals or go through QuerySet.update(), e.g. bulk_create(). `model` may be a proxy
+    # or a multi-table child, whose writes also change the rows of its parents.
+    targets = {model._meta.concrete_model} | {parent._meta.concrete_model for parent in model._meta.get_parent_list()}
+    for concrete_model in targets:
+        if concrete_model in _lookup_caches:
+            _lookup_caches[concrete_model].invalidate(using=using)
+
+
+def _invalidate_on_change(sender, using=None, **kwargs):
+    # post_save/post_delete receiver for every model, since they're sent with the proxy or child class as sender
+    invalidate_lookup_cache(sender, using=using)
+
+
+post_save.connect(_invalidate_on_change, dispatch_uid='phone_field.lookup_cache.post_save')
+post_delete.connect(_invalidate_on_change, dispatch_uid='phone_field.lookup_cache.post_delete')
+
+
+class PhoneLookupQuerySet(models.QuerySet):
+    def _is_cacheable(self):
+        # Only plain querysets share the cache: anything that changes which rows, columns or instances get() returns,
+        # or that has to reach the database (select_for_update(), using()), bypasses it
+        query = self.query
+        return not (
+            query.has_filters() or query.select_for_update or query.annotations or query.extra or query.select_related
+            or query.deferred_loading != (frozenset(), True) or query.low_mark or query.high_mark is not None
+            or self._prefetch_related_lookups or self._iterable_class is not ModelIterable or self._db is not None
+        )
+
+    def get_by_phone(self, number):
+        # `get(<phone field>=number)`, served from the model's PhoneLookupCache for unmodified querysets
+        concrete_model = self.model._meta.concrete_model
+        cache = _lookup_caches.get(concrete_model)
+        if cache is None:
+            # A multi-table child that inherited the manager: the cache holds instances of the parent
+            parent = next(p for p in concrete_model._meta.get_parent_list() if p in _lookup_caches)
+            return self.get(**{_lookup_caches[parent].field_name: number})
+        if not self._is_cacheable():
+            return self.get(**{cache.field_name: number})
+        obj = cache.get(self, number)
+        if obj.__class__ is not self.model:
+            # Proxies and their concrete model share the cache, and have the same fields
+            obj.__class__ = self.model
+        return obj
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        invalidate_lookup_cache(self.model, using=self.db)
+        return rows
+    update.alters_data = True
+
+
+class PhoneLookupManager(models.Manager.from_queryset(PhoneLookupQuerySet)):
+    # Opt-in manager for models with a unique PhoneField: `Model.objects.get_by_phone(number)` normalizes `number`
+    # once and serves repeated lookups from a PhoneLookupCache (`Model.objects.lookup_cache`), which is invalidated
+    # on post_save, post_delete and QuerySet.update().
+
+    def __init__(self, phone_field='phone', maxsize=1024, timeout=300, local_timeout=1.0, cache_alias='default'):
+        super().__init__()
+        self.phone_field = phone_field
+        self.cache_options = {
+            'maxsize': maxsize, 'timeout': timeout, 'local_timeout': local_timeout, 'cache_alias': cache_alias
+        }
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if cls._meta.abstract:
+            return
+        # The concrete model isn't known until the class is prepared
+        class_prepared.connect(self._register_lookup_cache, sender=cls, weak=False)
+
+    def _register_lookup_cache(self, sender, **kwargs):
+        # Proxies (and subclasses that inherit the manager without running contribute_to_class()) use their concrete
+        # model's cache
+        concrete_model = sender._meta.concrete_model
+        if concrete_model not in _lookup_caches:
+            _lookup_caches[concrete_model] = PhoneLookupCache(concrete_model, self.phone_field, **self.cache_options)
+
+    @property
+    def lookup_cache(self):
+        return _lookup_caches.get(self.model._meta.concrete_model)
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        try:
+            field = self.model._meta.get_field(self.phone_field)
+        except FieldDoesNotExist:
+            field = None
+        if not isinstance(field, PhoneField) or not field.unique:
+            errors.append(checks.Error(
+                "'{}' must be a unique PhoneField to use PhoneLookupManager.".format(self.phone_field),
+                obj=self,
+                id='phone_field.E001',
+            ))
+        return errors
@@ -1,14 +1,16 @@
+import json
 from django.core.exceptions import ValidationError
 from django.db import models
 from .phone_number import PhoneNumber
-from .forms import PhoneFormField
+from .forms import E164_ONLY_ERROR, PhoneArrayFormField, PhoneFormField
 
 
 class PhoneField(models.CharField):
     empty_values = models.CharField.empty_values + [PhoneNumber('')]
 
     def __init__(self, *args, **kwargs):
-        if kwargs.pop('E164_only', False):
+        self.E164_only = kwargs.pop('E164_only', False)
+        if self.E164_only:
             self.default_validators = [self._validate_E164]
         opts = {
             'max_length': 31
@@ -41,9 +43,102 @@ class PhoneField(models.CharField):
         if kwargs.get('form_class') is None:
             kwargs['form_class'] = PhoneFormField
             kwargs.pop('widget', None)
+        if issubclass(kwargs['form_class'], PhoneFormField):
+            kwargs.setdefault('E164_only', self.E164_only)
         return super(PhoneField, self).formfield(**kwargs)
 
     @staticmethod
     def _validate_E164(value):
         if value and not value.is_E164:
-            raise ValidationError('Only E164 numbers are supported here (+12223334444).')
+            raise ValidationError(E164_ONLY_ERROR)
+
+
+@PhoneField.register_lookup
+class AreaCode(models.lookups.StartsWith):
+    # `phone__area_code='415'`: a prefix match on the canonical "+1XXXXXXXXXX" value, so an index on the column applies
+    lookup_name = 'area_code'
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return '+1' + str(self.rhs)
+
+    def get_rhs_op(self, connection, rhs):
+        return connection.operators['startswith'] % rhs
+
+
+class PhoneArrayField(models.Field):
+    # A list of phone numbers in one column: a native array on PostgreSQL and a JSON list everywhere else. Elements are
+    # stored in canonical form (see PhoneNumber.cleaned), and loaded back as PhoneNumbers, which are only parsed when
+    # one of their attributes is used. `max_length` applies to each element.
+    description = 'List of phone numbers'
+    empty_strings_allowed = False
+
+    def __init__(self, *args, **kwargs):
+        opts = {
+            'max_length': 31
+        }
+        opts.update(kwargs)
+        super(PhoneArrayField, self).__init__(*args, **opts)
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return 'varchar({})[]'.format(self.max_length)
+        return connection.data_types['TextField'] % self.db_type_parameters(connection)
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = json.loads(value)
+        return [x if isinstance(x, PhoneNumber) else PhoneNumber(x) for x in value]
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        return [x.cleaned if isinstance(x, PhoneNumber) else PhoneNumber(x).cleaned for x in value if x]
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None or connection.vendor == 'postgresql':
+            return value
+        return json.dumps(value)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.get_prep_value(self.value_from_object(obj)))
+
+    def validate(self, value, model_instance):
+        super(PhoneArrayField, self).validate(value, model_instance)
+        for phone in value or []:
+            if len(phone) > self.max_length:
+                raise ValidationError('Phone number is too long.')
+
+    def formfield(self, **kwargs):
+        defaults = {'form_class': PhoneArrayFormField}
+        defaults.update(kwargs)
+        return super(PhoneArrayField, self).formfield(**defaults)
+
+
+@PhoneArrayField.register_lookup
+class ContainsNumber(models.Lookup):
+    # `phones__contains_number='(415) 123-4567'`. On PostgreSQL this is `phones @> ARRAY[...]`, which a GinIndex on the
+    # field can serve. Other backends match the number inside the stored JSON text.
+    lookup_name = 'contains_number'
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        if not isinstance(self.rhs, PhoneNumber):
+            return PhoneNumber(self.rhs).cleaned
+        return self.rhs.cleaned
+
+    def as_sql(self, compiler, connection):
+        lhs, params = self.process_lhs(compiler, connection)
+        pattern = '%{}%'.format(connection.ops.prep_for_like_query(json.dumps(self.rhs)))
+        return '{} {}'.format(lhs, connection.operators['contains'] % '%s'), params + [pattern]
+
+    def as_postgresql(self, compiler, connection):
+        lhs, params = self.process_lhs(compiler, connection)
+        return '{} @> %s::{}'.format(lhs, self.lhs.output_field.db_type(connection)), params + [[self.rhs]]
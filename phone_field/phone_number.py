@@ -130,3 +130,19 @@ class PhoneNumber:
         elif not ph and not self:
             return True
         return False
+
+
+def parse_phone_numbers(values):
+    # Parse a batch of raw values in one pass. Duplicate inputs share a single (already parsed) PhoneNumber, so each
+    # distinct value is only parsed once. Existing PhoneNumber instances are passed through as-is.
+    parsed = {}
+    result = []
+    for value in values:
+        if not isinstance(value, PhoneNumber):
+            key = str(value) if value else ''
+            value = parsed.get(key)
+            if value is None:
+                value = parsed[key] = PhoneNumber(key)
+        value.parse()
+        result.append(value)
+    return result
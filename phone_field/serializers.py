@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from .models import PhoneField
+from .phone_number import PhoneNumber, parse_phone_numbers
+
+
+class PhoneNumberField(serializers.CharField):
+    def __init__(self, *, E164_only=False, **kwargs):
+        super().__init__(**kwargs)
+        if E164_only:
+            self.validators.append(PhoneField._validate_E164)
+
+    def to_internal_value(self, data):
+        # Values pre-parsed by PhoneListSerializer are passed straight through, so the model layer receives the same
+        # (already parsed) PhoneNumber instance
+        if isinstance(data, PhoneNumber):
+            return data
+        return PhoneNumber(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        if not isinstance(value, PhoneNumber):
+            value = PhoneNumber(value)
+        return value.cleaned
+
+
+class PhoneListSerializer(serializers.ListSerializer):
+    # Use as `Meta.list_serializer_class` on a serializer with PhoneNumberFields. All phone numbers in the payload are
+    # normalized in one batch (parsing duplicates only once) before the usual per-item validation runs.
+
+    def _phone_field_names(self):
+        return [
+            name for name, field in self.child.fields.items()
+            if isinstance(field, PhoneNumberField) and not field.read_only
+        ]
+
+    def to_internal_value(self, data):
+        names = self._phone_field_names()
+        if names and isinstance(data, list):
+            data = [dict(item) if isinstance(item, dict) else item for item in data]
+            slots = [
+                (item, name) for item in data if isinstance(item, dict)
+                for name in names if isinstance(item.get(name), (str, int)) and not isinstance(item[name], bool)
+            ]
+            parsed = parse_phone_numbers(item[name] for item, name in slots)
+            for (item, name), phone in zip(slots, parsed):
+                item[name] = phone
+        return super().to_internal_value(data)
+
+
+def register_model_serializer_field():
+    # Map PhoneField to PhoneNumberField for every ModelSerializer. This changes DRF's global field mapping, so it's
+    # not done on import: call it once from your AppConfig.ready(), or declare PhoneNumberFields on your serializers.
+    serializers.ModelSerializer.serializer_field_mapping[PhoneField] = PhoneNumberField
@@ -0,0 +1,80 @@
+// Formats phone numbers as they're typed and validates them before the form is submitted. Inputs are found by the
+// "data-phone-field" attribute that PhoneWidget(client_side=True) renders, so this works for formset rows added later.
+//
+// Validation relies on the "pattern" attribute rendered by the server (PHONE_HTML_PATTERN), so there's no second copy
+// of the rules here. Formatting only handles ASCII digits: numbers typed with other digits (e.g. full-width) are
+// left as they are, and still validated like on the server.
+(function () {
+    'use strict';
+
+    // Only reformat input that could still become a US number; anything else (letters, international) is left alone
+    var FORMATTABLE = /^\s*(\+?1)?[-.\s()\d]*$/;
+
+    function formatPartial(value) {
+        if (!FORMATTABLE.test(value)) {
+            return value;
+        }
+        var digits = value.replace(/\D/g, '');
+        if (digits.length === 11 && digits.charAt(0) === '1') {
+            digits = digits.slice(1);
+        }
+        // Leave short input alone, so typed "(", "-" and spaces aren't removed before there's anything to format
+        if (digits.length <= 3 || digits.length > 10 || /^[01]/.test(digits)) {
+            return value;
+        }
+        if (digits.length > 6) {
+            return '(' + digits.slice(0, 3) + ') ' + digits.slice(3, 6) + '-' + digits.slice(6);
+        }
+        return '(' + digits.slice(0, 3) + ') ' + digits.slice(3);
+    }
+
+    function shouldFormat(input, event) {
+        // Only reformat after a digit is typed (or text is pasted) at the end of the value. Editing in the middle
+        // would otherwise move the caret to the end, and typed separators would be replaced immediately.
+        if (input.selectionStart !== input.value.length || input.selectionEnd !== input.value.length) {
+            return false;
+        }
+        if (event.inputType === 'insertFromPaste') {
+            return true;
+        }
+        return event.inputType === 'insertText' && /^\d$/.test(event.data || '');
+    }
+
+    function validate(input) {
+        var message = '';
+        if (input.hasAttribute('data-e164-only')) {
+            if (input.getAttribute('data-phone-field') === 'phone') {
+                // Empty values never mismatch; "required" is checked by the browser separately
+                if (input.validity.patternMismatch) {
+                    message = input.getAttribute('data-error-message');
+                }
+            } else if (input.value.trim()) {
+                // E164 numbers can't have extensions
+                message = input.getAttribute('data-error-message');
+            }
+        }
+        input.setCustomValidity(message || '');
+    }
+
+    document.addEventListener('input', function (event) {
+        var input = event.target;
+        if (!input.hasAttribute || !input.hasAttribute('data-phone-field')) {
+            return;
+        }
+        if (input.getAttribute('data-phone-field') === 'phone' && shouldFormat(input, event)) {
+            var formatted = formatPartial(input.value);
+            if (formatted !== input.value) {
+                input.value = formatted;
+            }
+        }
+        validate(input);
+    });
+
+    // Values rendered by the server (e.g. after a failed submission) need checking too
+    document.addEventListener('DOMContentLoaded', function () {
+        var inputs = document.querySelectorAll('[data-phone-field]');
+        for (var i = 0; i < inputs.length; i++) {
+            validate(inputs[i]);
+        }
+    });
+})();
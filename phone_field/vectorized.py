@@ -0,0 +1,145 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+from .phone_number import BACKEND_EXTENSION_SEPARATOR, VALID_EXTENSION_SEPARATOR
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+
+# Vectorized equivalent of `PhoneNumber.parse()` for whole columns, built on Arrow compute kernels (RE2 regexes).
+# RE2's `\d` and `\s` are ASCII-only, while Python's `re` and `str.strip()` are Unicode-aware, so the patterns below
+# spell out the Unicode classes explicitly to keep the results identical to the scalar parser.
+
+# Every character for which `str.isspace()` is true (what `str.strip()` and `\s` in `re` use)
+_WS = r'[\t\n\x{0b}\x{0c}\r\x{1c}-\x{1f} \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+
+# RE2 translation of PHONE_TEST_REGEX (`\d` in `re` matches any Unicode decimal digit)
+_PHONE_TEST_RE2 = (r'^\+?1?-?' + _WS + r'*'
+                   r'\(?(?P<area>[2-9]\p{Nd}{2})\)?'
+                   r'[\-\.' + _WS[1:-1] + r']*'
+                   r'(?P<exchange>\p{Nd}{3})'
+                   r'[\-\.' + _WS[1:-1] + r']*'
+                   r'(?P<line>\p{Nd}{4})$')
+
+_STRIP_RE2 = r'^' + _WS + r'+|' + _WS + r'+$'
+_SPLIT_VALID_RE2 = r'(?s)^(?P<base>.*?)' + VALID_EXTENSION_SEPARATOR + r'(?P<rest>.*)$'
+_SPLIT_BACKEND_RE2 = r'(?s)^(?P<base>[^' + BACKEND_EXTENSION_SEPARATOR + r']*)' + BACKEND_EXTENSION_SEPARATOR + \
+                     r'(?P<rest>.*)$'
+_SEP_VALID_RE2 = _WS + r'*' + VALID_EXTENSION_SEPARATOR + _WS + r'*'
+_SEP_BACKEND_RE2 = _WS + r'*' + BACKEND_EXTENSION_SEPARATOR + _WS + r'*'
+_EMPTY_EXTENSION_RE2 = r'^{0}|{0}$|{0}{0}'.format(BACKEND_EXTENSION_SEPARATOR)
+
+COLUMNS = ('cleaned', 'formatted', 'is_E164', 'is_usa')
+
+
+def _concat(*parts):
+    return pc.binary_join_element_wise(*parts, '')
+
+
+def _strip(arr):
+    return pc.replace_substring_regex(arr, pattern=_STRIP_RE2, replacement='')
+
+
+def _str_array(values):
+    # Convert like `PhoneNumber` does (`str(value)`, falsy values are empty). Nulls and NaNs stay null.
+    na = getattr(pd, 'NA', None)
+    return pa.array([
+        None if v is None or v is na or (isinstance(v, float) and v != v) else str(v) if v else '' for v in values
+    ], type=pa.string())
+
+
+def _to_arrow(values):
+    # Let pyarrow infer the type, so numeric columns (e.g. from `pd.read_csv`) are accepted and cast below
+    try:
+        if pd is not None and isinstance(values, pd.Series):
+            values = pa.array(values, from_pandas=True)
+        elif isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        elif not isinstance(values, pa.Array):
+            values = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types, e.g. strings and ints
+        values = _str_array(values)
+    if pa.types.is_integer(values.type):
+        # `PhoneNumber(0)` is an empty number
+        values = values.cast(pa.string())
+        values = pc.if_else(pc.equal(values, '0'), '', values)
+    elif not pa.types.is_string(values.type):
+        # Arrow formats floats and bools differently from `str()`
+        values = _str_array(values.to_pylist())
+    # Nulls behave like `PhoneNumber(None)`, i.e. an empty number
+    return pc.fill_null(values, '')
+
+
+def normalize_arrow(values):
+    # Parse a pyarrow string array (or anything pyarrow can convert to one) and return a `pyarrow.Table` with the
+    # `cleaned`, `formatted`, `is_E164` and `is_usa` columns, matching the `PhoneNumber` properties row by row.
+    raw = _to_arrow(values)
+
+    # Split off extensions: ", press " takes precedence over "x", and only the first separator matters here
+    by_valid = pc.extract_regex(raw, pattern=_SPLIT_VALID_RE2)
+    by_backend = pc.extract_regex(raw, pattern=_SPLIT_BACKEND_RE2)
+    is_valid_sep = pc.is_valid(by_valid)
+    has_extensions = pc.or_(is_valid_sep, pc.is_valid(by_backend))
+    base = _strip(pc.coalesce(pc.struct_field(by_valid, 'base'), pc.struct_field(by_backend, 'base'), raw))
+    rest = pc.coalesce(pc.struct_field(by_valid, 'rest'), pc.struct_field(by_backend, 'rest'), '')
+
+    # Clean base phone number
+    match = pc.extract_regex(base, pattern=_PHONE_TEST_RE2)
+    is_usa = pc.is_valid(match)
+    area, exchange, line = (pc.fill_null(pc.struct_field(match, f), '') for f in ('area', 'exchange', 'line'))
+    base_clean = pc.if_else(is_usa, _concat('+1', area, exchange, line), base)
+    base_fmt = pc.if_else(is_usa, _concat('(', area, ') ', exchange, '-', line), base_clean)
+
+    # Clean extensions: strip each one and join them with the backend separator
+    extensions = _strip(pc.if_else(
+        is_valid_sep,
+        pc.replace_substring_regex(rest, pattern=_SEP_VALID_RE2, replacement=BACKEND_EXTENSION_SEPARATOR),
+        pc.replace_substring_regex(rest, pattern=_SEP_BACKEND_RE2, replacement=BACKEND_EXTENSION_SEPARATOR)
+    ))
+    separator_count = pc.if_else(is_valid_sep,
+                                 pc.count_substring(rest, VALID_EXTENSION_SEPARATOR),
+                                 pc.count_substring(rest, BACKEND_EXTENSION_SEPARATOR))
+
+    # Valid extensions are all non-empty and only digits. An "x" left inside an extension split on ", press " shows up
+    # as an extra separator, which makes the counts disagree.
+    valid_extensions = pc.and_(pc.and_(
+        has_extensions,
+        pc.utf8_is_digit(pc.replace_substring(extensions, BACKEND_EXTENSION_SEPARATOR, ''))
+    ), pc.and_(
+        pc.invert(pc.match_substring_regex(extensions, _EMPTY_EXTENSION_RE2)),
+        pc.equal(pc.count_substring(extensions, BACKEND_EXTENSION_SEPARATOR), separator_count)
+    ))
+
+    cleaned = pc.if_else(has_extensions, _concat(base_clean, BACKEND_EXTENSION_SEPARATOR, extensions), base_clean)
+    formatted = pc.if_else(
+        valid_extensions,
+        _concat(base_fmt, VALID_EXTENSION_SEPARATOR,
+                pc.replace_substring(extensions, BACKEND_EXTENSION_SEPARATOR, VALID_EXTENSION_SEPARATOR)),
+        pc.if_else(has_extensions, _concat(base_fmt, BACKEND_EXTENSION_SEPARATOR, extensions), base_fmt)
+    )
+    is_E164 = pc.and_(is_usa, pc.invert(has_extensions))
+    return pa.table([cleaned, formatted, is_E164, is_usa], names=list(COLUMNS))
+
+
+def normalize(values):
+    # Vectorized `PhoneNumber` parsing. A pandas Series gives back a DataFrame with the same index; anything else
+    # gives back a `pyarrow.Table` (see `normalize_arrow()`).
+    table = normalize_arrow(values)
+    if pd is not None and isinstance(values, pd.Series):
+        df = table.to_pandas()
+        df.index = values.index
+        return df
+    return table
+
+
+def to_parquet(values, where, **kwargs):
+    # Normalize `values` and write the resulting columns to a Parquet file. Extra kwargs go to
+    # `pyarrow.parquet.write_table()`.
+    import pyarrow.parquet as pq
+
+    table = normalize_arrow(values)
+    pq.write_table(table, where, **kwargs)
+    return table
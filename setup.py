@@ -15,6 +15,10 @@ setup(
     platforms=['OS Independent'],
     description='Lightweight model and form field for phone numbers in Django',
     install_requires=['Django>=1.10'],
+    extras_require={
+        'pandas': ['pandas', 'pyarrow'],
+        'drf': ['djangorestframework'],
+    },
     long_description=LONG_DESCRIPTION,
     long_description_content_type='text/markdown',
     author='Andrew Mackowski',
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class TestAppConfig(AppConfig):
     name = 'test_app'
+
+    def ready(self):
+        try:
+            from phone_field.serializers import register_model_serializer_field
+        except ImportError:  # djangorestframework isn't installed
+            return
+        register_model_serializer_field()
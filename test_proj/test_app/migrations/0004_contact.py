@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:42
+
+import phone_field.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_app', '0003_businesses'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contact',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=31)),
+                ('phones', phone_field.models.PhoneArrayField(blank=True, default=list, max_length=31)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:43
+
+import phone_field.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_app', '0004_contact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestModelE164',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', phone_field.models.PhoneField(max_length=15)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_app', '0005_testmodele164'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeProxy',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('test_app.employee',),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
-from phone_field import PhoneField
+from phone_field import PhoneField, PhoneArrayField
+from phone_field.managers import PhoneLookupManager
 
 
 class TestModel(models.Model):
@@ -17,6 +18,10 @@ class TestModelBlankNull(models.Model):
     phone = PhoneField(blank=True, null=True)
 
 
+class TestModelE164(models.Model):
+    phone = PhoneField(E164_only=True, max_length=15)
+
+
 class Business(models.Model):
     name = models.CharField(max_length=31)
 
@@ -25,3 +30,15 @@ class Employee(models.Model):
     name = models.CharField(max_length=31)
     business = models.ForeignKey(Business, on_delete=models.CASCADE)
     phone = PhoneField(blank=False, unique=True)
+
+    objects = PhoneLookupManager()
+
+
+class EmployeeProxy(Employee):
+    class Meta:
+        proxy = True
+
+
+class Contact(models.Model):
+    name = models.CharField(max_length=31)
+    phones = PhoneArrayField(blank=True, default=list)
@@ -1,12 +1,40 @@
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
 from django import VERSION as DJANGO_VERSION
 from django.contrib import admin
+from django.core.cache import cache
 from django.db import connection
-from django.forms import Form, modelform_factory, inlineformset_factory
+from django.db.models import Count
+from django.forms import Form, TextInput, modelform_factory, inlineformset_factory
 from django.template import Context, Template
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
+from benchmarks import corpus, differential
 from phone_field import PhoneNumber
-from phone_field.forms import PhoneFormField
-from .models import TestModel, TestModelOptional, TestModelBlankNull, Business, Employee
+from phone_field.admin import AreaCodeListFilter
+from phone_field.bulk import bulk_upsert, validate_phones
+from phone_field.export import PhoneExportView, export_rows, stream_csv, stream_ndjson
+from phone_field.managers import PhoneLookupManager
+from phone_field.forms import PhoneFormField, PhoneWidget, PHONE_HTML_PATTERN
+from .models import (
+    TestModel, TestModelOptional, TestModelBlankNull, TestModelE164, Business, Employee, EmployeeProxy, Contact
+)
+
+try:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from phone_field import vectorized
+except ImportError:
+    vectorized = None
+
+try:
+    from rest_framework import serializers
+    from phone_field.serializers import PhoneNumberField, PhoneListSerializer
+except ImportError:
+    serializers = None
 
 
 PARSING_TESTS = [
@@ -103,6 +131,152 @@ class ParsingTest(TestCase):
                 self.assertEqual(getattr(ph, key), val, msg=label)
 
 
+@unittest.skipIf(vectorized is None, 'pandas and pyarrow are required')
+class VectorizedTest(TestCase):
+    # Inputs on top of PARSING_TESTS that exercise the corners of the extension and whitespace handling
+    EXTRA_INPUTS = [
+        '', None, 'x', 'x5', '415 123 4567 x', '415-123-4567xabc', '+1-415 123 4567x1x2', '1x2, press 3 ',
+        ' , press , press 4', '415 123 4567, press 1x2', '\u0664\u0661\u0665 123 4567', '415 123 4567 x \u00b2',
+        '\u3000415 123 4567\u3000x\u30002', '+1 (212) 555-1234 ', 'garbage'
+    ]
+
+    def _inputs(self):
+        return [input_str for input_str, label, attrs in PARSING_TESTS] + self.EXTRA_INPUTS
+
+    def _assert_matches_scalar(self, inputs, rows):
+        for input_str, row in zip(inputs, rows):
+            ph = PhoneNumber(input_str)
+            for key in vectorized.COLUMNS:
+                self.assertEqual(row[key], getattr(ph, key), msg=repr(input_str))
+
+    def test_pandas(self):
+        inputs = self._inputs()
+        series = pd.Series(inputs, index=range(100, 100 + len(inputs)))
+        df = vectorized.normalize(series)
+        self.assertEqual(list(df.columns), list(vectorized.COLUMNS))
+        self.assertEqual(list(df.index), list(series.index))
+        self._assert_matches_scalar(inputs, df.to_dict('records'))
+
+    def test_numeric(self):
+        # e.g. a column of bare numbers read by `pd.read_csv`
+        inputs = [4151234567, 14151234567, 0, 123]
+        df = vectorized.normalize(pd.Series(inputs))
+        self._assert_matches_scalar(inputs, df.to_dict('records'))
+        self._assert_matches_scalar(inputs, vectorized.normalize(inputs).to_pylist())
+
+        inputs = [4151234567.0, 0.0, 2.5]
+        self._assert_matches_scalar(inputs, vectorized.normalize(pd.Series(inputs)).to_dict('records'))
+        inputs = ['415 123 4567', 4151234567, None]
+        self._assert_matches_scalar(inputs, vectorized.normalize(inputs).to_pylist())
+
+    def test_arrow(self):
+        inputs = self._inputs()
+        table = vectorized.normalize(pa.chunked_array([inputs[:5], inputs[5:]]))
+        self._assert_matches_scalar(inputs, table.to_pylist())
+
+    def test_corpus(self):
+        report = differential.check(differential.vectorized_path, corpus.generate(5000, seed=1), chunk_size=1000)
+        self.assertEqual(report.mismatches, 0, msg=str(report))
+
+    def test_parquet(self):
+        inputs = self._inputs()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'phones.parquet')
+            vectorized.to_parquet(pd.Series(inputs), path)
+            self._assert_matches_scalar(inputs, pq.read_table(path).to_pylist())
+
+
+if serializers is not None:
+    class PhoneSerializer(serializers.Serializer):
+        phone = PhoneNumberField(E164_only=True)
+
+        class Meta:
+            list_serializer_class = PhoneListSerializer
+
+    class TestModelSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = TestModel
+            fields = ('phone', 'first_name', 'last_name')
+            list_serializer_class = PhoneListSerializer
+
+
+@unittest.skipIf(serializers is None, 'djangorestframework is required')
+class SerializerTest(TestCase):
+    def test_field(self):
+        s = PhoneSerializer(data={'phone': '(415) 123-4567'})
+        self.assertTrue(s.is_valid())
+        self.assertIsInstance(s.validated_data['phone'], PhoneNumber)
+        self.assertEqual(s.data['phone'], '+14151234567')
+
+    def test_E164_only(self):
+        s = PhoneSerializer(data={'phone': '415 123 4567 x 88'})
+        self.assertFalse(s.is_valid())
+        self.assertIn('phone', s.errors)
+
+    def test_list_batch(self):
+        s = PhoneSerializer(data=[{'phone': '415.123.4567'}, {'phone': '+44 20 1234 3000'}, {'phone': '4151234567'}],
+                            many=True)
+        self.assertFalse(s.is_valid())
+        self.assertIn('phone', s.errors[1])
+
+        s = PhoneSerializer(data=[{'phone': '415.123.4567'}, {'phone': '415.123.4567'}], many=True)
+        self.assertTrue(s.is_valid())
+        first, second = (item['phone'] for item in s.validated_data)
+        # Duplicate inputs are parsed once and share the same PhoneNumber
+        self.assertIs(first, second)
+
+    def test_model_serializer(self):
+        self.assertIsInstance(TestModelSerializer().fields['phone'], PhoneNumberField)
+        s = TestModelSerializer(data=[
+            {'phone': '415 123 4567 x 88', 'first_name': 'A', 'last_name': 'B'},
+            {'phone': '(415) 222-3333', 'first_name': 'C', 'last_name': 'D'},
+        ], many=True)
+        self.assertTrue(s.is_valid())
+        s.save()
+        self.assertEqual(sorted(str(obj.phone) for obj in TestModel.objects.all()),
+                         ['(415) 123-4567, press 88', '(415) 222-3333'])
+
+
+class CorpusTest(TestCase):
+    def test_deterministic(self):
+        self.assertEqual(list(corpus.generate(1000, seed=5)), list(corpus.generate(1000, seed=5)))
+        self.assertNotEqual(list(corpus.generate(1000, seed=5)), list(corpus.generate(1000, seed=6)))
+
+    def test_duplicate_rate(self):
+        self.assertEqual(len(set(corpus.generate(1000, duplicate_rate=1, shapes={'us_number': 1}))), 1)
+        values = list(corpus.generate(1000, duplicate_rate=0, shapes={'us_number': 1}))
+        self.assertGreater(len(set(values)), 990)
+
+    def test_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.jsonl')
+            corpus.write_corpus(path, 500, seed=2)
+            self.assertEqual(list(corpus.read_corpus(path)), list(corpus.generate(500, seed=2)))
+
+    def test_differential(self):
+        report = differential.check(differential.batch_path, corpus.generate(5000), chunk_size=1000)
+        self.assertEqual((report.rows, report.mismatches), (5000, 0))
+
+        def broken(values):
+            return [{'cleaned': ''.join(c for c in v if c.isdigit())} for v in values]
+
+        report = differential.check(broken, corpus.generate(100))
+        self.assertGreater(report.mismatches, 0)
+        self.assertTrue(report.examples)
+
+    def test_differential_missing_rows(self):
+        report = differential.check(lambda values: [], corpus.generate(100), chunk_size=30)
+        self.assertEqual((report.rows, report.mismatches), (100, 100))
+        report = differential.check(lambda values: differential.batch_path(values)[1:], corpus.generate(100))
+        self.assertEqual(report.mismatches, 100)
+        self.assertTrue(report.examples)
+
+    def test_differential_unknown_attributes(self):
+        report = differential.check(lambda values: [{'clean': 'zz'} for _ in values], corpus.generate(100))
+        self.assertEqual(report.mismatches, 100)
+        self.assertTrue(report.examples)
+
+
 class RenderingTest(TestCase):
     def test_native(self):
         t = Template(r'{{ ph }}')
@@ -162,6 +336,73 @@ class OptionalFormTest(TestCase):
         self.assertEqual(str(f.cleaned_data['phone']), '(415) 123-4567, press 88')
 
 
+class WidgetRenderingTest(TestCase):
+    def test_matches_django_inputs(self):
+        # phone_widget.html includes each sub-widget's own template, so the markup is Django's
+        widget = PhoneWidget()
+        html = widget.render('phone', PhoneNumber('415 123 4567 x 12'), {'required': True, 'id': 'id_phone'})
+        expected = TextInput({'size': 13}).render('phone_0', '(415) 123-4567', {'required': True, 'id': 'id_phone_0'})
+        expected += '<span class="phone-field-ext">&nbsp;&nbsp;ext.&nbsp;&nbsp;</span>'
+        expected += TextInput({'size': 4}).render('phone_1', '12', {'id': 'id_phone_1'})
+        self.assertHTMLEqual(html, expected)
+
+    def test_no_state_change(self):
+        widget = PhoneWidget()
+        widget.render('phone', '', {'required': True})
+        self.assertFalse(widget.widgets[0].is_required)
+        self.assertEqual(widget.decompress(None), ('', ''))
+
+
+class ClientSideWidgetTest(TestCase):
+    def test_default(self):
+        f = TestFormRequired()
+        self.assertNotIn('data-phone-field', str(f))
+        self.assertEqual(str(f.media), '')
+
+    def test_client_side(self):
+        class ClientSideForm(Form):
+            phone = PhoneFormField(widget=PhoneWidget(client_side=True))
+
+        f = ClientSideForm()
+        html = str(f)
+        self.assertIn('inputmode="tel" data-phone-field="phone"', html)
+        self.assertIn('inputmode="numeric" data-phone-field="extension"', html)
+        self.assertNotIn('pattern=', html)
+        self.assertIn('phone_field/phone_widget.js', str(f.media))
+
+    def test_E164_only(self):
+        class ClientSideForm(Form):
+            phone = PhoneFormField(E164_only=True, widget=PhoneWidget(client_side=True))
+
+        html = str(ClientSideForm()['phone'])
+        self.assertEqual(html.count('data-e164-only'), 2)
+        self.assertEqual(html.count('pattern='), 1)
+        self.assertFalse(ClientSideForm({'phone_0': '415 123 4567', 'phone_1': '8'}).is_valid())
+        self.assertTrue(ClientSideForm({'phone_0': '415 123 4567'}).is_valid())
+
+    def test_html_pattern(self):
+        # Python's re has no "\p{Nd}", but "\d" means the same there. The pattern then accepts the same inputs as
+        # PHONE_TEST_REGEX (modulo surrounding whitespace), including non-ASCII digits.
+        self.assertNotIn(r'\d', PHONE_HTML_PATTERN)
+        pattern = re.compile('^(?:{})$'.format(PHONE_HTML_PATTERN.replace(r'\p{Nd}', r'\d')))
+        inputs = [(input_str, label, attrs['is_E164']) for input_str, label, attrs in PARSING_TESTS]
+        inputs += [(s, repr(s), PhoneNumber(s).is_E164) for s in corpus.generate(200, shapes={'unicode_digits': 1})]
+        inputs += [('4\u0661\u0665 \uff11\uff12\uff13 4567', 'mixed digits', True)]
+        for input_str, label, is_E164 in inputs:
+            self.assertEqual(bool(pattern.match(input_str)), is_E164, msg=label)
+
+    def test_modelform_E164_only(self):
+        Form = modelform_factory(TestModelE164, fields=('phone',))
+        self.assertTrue(Form.base_fields['phone'].E164_only)
+        f = Form({'phone_0': '+44 20 1234'})
+        self.assertFalse(f.is_valid())
+        self.assertEqual(f.errors['phone'], ['Only E164 numbers are supported here (+12223334444).'])
+
+        Form = modelform_factory(TestModelE164, fields=('phone',), field_classes={'phone': PhoneFormField},
+                                 widgets={'phone': PhoneWidget(client_side=True)})
+        self.assertIn('pattern=', str(Form()))
+
+
 class ModelFormTest(TestCase):
     def test_modelform_rendering(self):
         Form = modelform_factory(TestModel, fields=('phone',))
@@ -213,6 +454,171 @@ class AdminFormTest(TestCase):
         self.assertEqual(str(f), _rendered_field_html(phone_number='(415) 123-4567', extension='88', required=True))
 
 
+class AreaCodeListFilterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        business = Business.objects.create(name='Some Business')
+        for i, phone in enumerate(['415 111 2222', '(415) 333-4444 x 5', '212 555 1234', '+44 (0)20-1234-3000',
+                                   '+1 (0)20-1234']):
+            Employee.objects.create(name=str(i), business=business, phone=phone)
+        self.ma = admin.ModelAdmin(Employee, admin.AdminSite())
+        self.ma.list_filter = [('phone', AreaCodeListFilter)]
+
+    def _changelist(self, params=None):
+        request = RequestFactory().get('/', params or {})
+        request.user = MockSuperUser()
+        return self.ma.get_changelist_instance(request)
+
+    def test_lookup(self):
+        self.assertEqual(Employee.objects.filter(phone__area_code='415').count(), 2)
+        self.assertEqual(Employee.objects.filter(phone__area_code='212').count(), 1)
+
+    def test_choices(self):
+        changelist = self._changelist()
+        spec = changelist.filter_specs[0]
+        self.assertEqual(spec.title, 'phone area code')
+        self.assertEqual([c['display'] for c in spec.choices(changelist)], ['All', '212 (1)', '415 (2)'])
+
+        # Counts are cached
+        Employee.objects.create(name='5', business=Business.objects.get(), phone='212 555 9999')
+        changelist = self._changelist()
+        self.assertEqual(list(changelist.filter_specs[0].choices(changelist))[1]['display'], '212 (1)')
+
+    def test_filtered(self):
+        changelist = self._changelist({'phone__area_code': '415'})
+        self.assertEqual(sorted(e.name for e in changelist.queryset), ['0', '1'])
+        selected = [c['display'] for c in changelist.filter_specs[0].choices(changelist) if c['selected']]
+        self.assertEqual(selected, ['415 (2)'])
+
+    @unittest.skipIf(DJANGO_VERSION < (5, 0), 'Counts are table-wide before Django 5.0')
+    def test_counts_follow_changelist(self):
+        # Counts reflect the search and other filters, but not the selected area code
+        self.ma.search_fields = ['name']
+        changelist = self._changelist({'q': '1', 'phone__area_code': '212'})
+        self.assertEqual(list(changelist.queryset), [])
+        self.assertEqual([c['display'] for c in changelist.filter_specs[0].choices(changelist)], ['All', '415 (1)'])
+
+
+class PhoneLookupManagerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.lookup_cache = Employee.objects.lookup_cache
+        self.lookup_cache.invalidate()
+        self.lookup_cache.reset_stats()
+        self.business = Business.objects.create(name='Some Business')
+        self.emp = Employee.objects.create(name='1', business=self.business, phone='4151112222')
+        self.lookup_cache.reset_stats()
+
+    def test_cached_lookups(self):
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                emp = Employee.objects.get_by_phone('(415) 111-2222')
+                self.assertEqual(emp.pk, self.emp.pk)
+        self.assertEqual(self.lookup_cache.stats, {
+            'local_hits': 2, 'cache_hits': 0, 'misses': 1, 'invalidations': 0, 'hit_rate': 2 / 3
+        })
+
+        # A second process would only have the shared cache
+        self.lookup_cache._lru.clear()
+        with self.assertNumQueries(0):
+            Employee.objects.get_by_phone('415.111.2222')
+        self.assertEqual(self.lookup_cache.stats['cache_hits'], 1)
+
+    def test_returns_copies(self):
+        Employee.objects.get_by_phone('4151112222').name = 'changed'
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, '1')
+
+    def test_missing(self):
+        with self.assertRaises(Employee.DoesNotExist):
+            Employee.objects.get_by_phone('415 999 0000')
+
+    def test_filtered_queryset(self):
+        Employee.objects.get_by_phone('4151112222')
+        with self.assertNumQueries(1):
+            Employee.objects.filter(name='1').get_by_phone('4151112222')
+        with self.assertRaises(Employee.DoesNotExist):
+            Employee.objects.filter(name='2').get_by_phone('4151112222')
+
+    def test_modified_queryset(self):
+        Employee.objects.get_by_phone('4151112222')
+        querysets = [
+            Employee.objects.select_for_update(), Employee.objects.only('id'), Employee.objects.defer('name'),
+            Employee.objects.annotate(n=Count('pk')), Employee.objects.select_related('business'),
+            Employee.objects.prefetch_related('business'), Employee.objects.using('default'),
+        ]
+        for queryset in querysets:
+            with self.assertNumQueries(1 + bool(queryset._prefetch_related_lookups)):
+                queryset.get_by_phone('4151112222')
+
+        # Nothing they returned was cached
+        self.assertEqual(self.lookup_cache.stats['misses'], 1)
+        emp = Employee.objects.get_by_phone('4151112222')
+        self.assertEqual(emp.get_deferred_fields(), set())
+        self.assertFalse(hasattr(emp, 'n'))
+
+    def test_proxy(self):
+        self.assertIs(EmployeeProxy.objects.lookup_cache, self.lookup_cache)
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, '1')
+
+        proxy = EmployeeProxy.objects.get(pk=self.emp.pk)
+        proxy.name = 'renamed'
+        proxy.save()
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'renamed')
+
+        # Both share the cache, but get instances of their own class
+        with self.assertNumQueries(0):
+            self.assertIsInstance(EmployeeProxy.objects.get_by_phone('4151112222'), EmployeeProxy)
+            self.assertIs(type(Employee.objects.get_by_phone('4151112222')), Employee)
+
+        EmployeeProxy.objects.filter(pk=self.emp.pk).update(name='updated')
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'updated')
+
+    def test_invalidation_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.emp.name = 'renamed'
+            self.emp.save()
+            # Stands in for another process caching the row before the commit
+            Employee.objects.get_by_phone('4151112222')
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.lookup_cache.stats['invalidations'], 2)
+        with self.assertNumQueries(1):
+            Employee.objects.get_by_phone('4151112222')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Employee.objects.filter(pk=self.emp.pk).update(name='updated')
+        self.assertEqual(len(callbacks), 1)
+
+    def test_invalidation_on_save(self):
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, '1')
+        self.emp.name = 'renamed'
+        self.emp.save()
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'renamed')
+
+        self.emp.phone = '415 333 4444'
+        self.emp.save()
+        with self.assertRaises(Employee.DoesNotExist):
+            Employee.objects.get_by_phone('4151112222')
+        self.assertEqual(Employee.objects.get_by_phone('4153334444').pk, self.emp.pk)
+
+    def test_invalidation_on_delete(self):
+        Employee.objects.get_by_phone('4151112222')
+        self.emp.delete()
+        with self.assertRaises(Employee.DoesNotExist):
+            Employee.objects.get_by_phone('4151112222')
+
+    def test_invalidation_on_update(self):
+        Employee.objects.get_by_phone('4151112222')
+        Employee.objects.filter(pk=self.emp.pk).update(name='updated')
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'updated')
+        self.assertEqual(self.lookup_cache.stats['invalidations'], 1)
+
+    def test_check(self):
+        self.assertEqual(Employee.objects.check(), [])
+        manager = PhoneLookupManager(phone_field='name')
+        manager.model = Employee
+        self.assertEqual([e.id for e in manager.check()], ['phone_field.E001'])
+
+
 class InlineFormsetTest(TestCase):
     def test_validate_inlineformset(self):
         FormSet = inlineformset_factory(Business, Employee, fields=('name', 'phone'))
@@ -233,6 +639,198 @@ class InlineFormsetTest(TestCase):
         self.assertTrue(formset.is_valid())
 
 
+class BulkValidationTest(TestCase):
+    def test_instances(self):
+        objs = [
+            TestModelE164(phone='415.123.4567'),
+            TestModelE164(phone='415.123.4567 x 8'),
+            TestModelE164(phone=''),
+            TestModelE164(phone='+44 (0)20-1234-3000 and more'),
+            TestModelE164(phone='(415) 222-3333'),
+        ]
+        result = validate_phones(TestModelE164, objs)
+        self.assertEqual(result.valid, [objs[0], objs[4]])
+        self.assertEqual([r.index for r in result.rejected], [1, 2, 3])
+        self.assertEqual(result.errors[1], {'phone': ['Only E164 numbers are supported here (+12223334444).']})
+        self.assertEqual(result.errors[2], {'phone': ['This field cannot be blank.']})
+        self.assertEqual(result.errors[3]['phone'][0], 'Phone number is too long.')
+        self.assertIsInstance(objs[0].phone, PhoneNumber)
+
+        TestModelE164.objects.bulk_create(result.valid)
+        self.assertEqual(sorted(o.phone.cleaned for o in TestModelE164.objects.all()), ['+14151234567', '+14152223333'])
+
+    def test_dicts(self):
+        rows = [{'phone': '415 123 4567'}, {'phone': None}, {'name': 'no phone'}]
+        result = validate_phones(TestModelBlankNull, rows)
+        self.assertEqual(result.rejected, [])
+        self.assertEqual(rows[0]['phone'], '+14151234567')
+        self.assertIsNone(rows[1]['phone'])
+
+        result = validate_phones(TestModel, [{'phone': '415 123 4567'}, {'phone': ''}], fields=['phone'])
+        self.assertEqual(list(result.errors), [1])
+
+
+class BulkUpsertTest(TestCase):
+    def setUp(self):
+        self.business = Business.objects.create(name='Some Business')
+        Employee.objects.create(name='old 1', business=self.business, phone='415 111 2222')
+        Employee.objects.create(name='old 2', business=self.business, phone='415 333 4444 x 5')
+
+    def _rows(self):
+        return [
+            {'name': 'new 1', 'business': self.business, 'phone': '(415) 111-2222'},
+            {'name': 'new 2', 'business': self.business, 'phone': '415.555.6666'},
+            {'name': 'bad', 'business': self.business, 'phone': ''},
+            {'name': 'new 3', 'business': self.business, 'phone': '415 555 6666'},
+            {'name': 'new 4', 'business': self.business, 'phone': '415 333 4444 x 5'},
+            {'name': 'too long', 'business': self.business, 'phone': '1' * 40},
+        ]
+
+    def _check(self, result):
+        self.assertEqual((result.inserted, result.updated, result.duplicates), (1, 2, 1))
+        self.assertEqual([r.index for r in result.rejected], [2, 5])
+        self.assertEqual(
+            sorted((e.name, e.phone.cleaned) for e in Employee.objects.all()),
+            [('new 1', '+14151112222'), ('new 3', '+14155556666'), ('new 4', '+14153334444x5')]
+        )
+
+    def test_upsert(self):
+        self._check(bulk_upsert(Employee, self._rows(), batch_size=2))
+
+    def test_upsert_fallback(self):
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            self._check(bulk_upsert(Employee, self._rows(), batch_size=2))
+
+    def test_instances(self):
+        objs = [Employee(name='inst', business=self.business, phone='4151112222')]
+        result = bulk_upsert(Employee, objs, update_fields=['name'])
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual(Employee.objects.get(phone='4151112222').name, 'inst')
+
+    def test_partial_rows(self):
+        # Update-only rows don't need the fields required for inserts, on either path
+        for supports_upsert in (True, False):
+            with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', supports_upsert):
+                result = bulk_upsert(Employee, [{'phone': '4151112222', 'name': str(supports_upsert)}])
+            self.assertEqual((result.inserted, result.updated, result.rejected), (0, 1, []))
+            self.assertEqual(Employee.objects.get(phone='4151112222').name, str(supports_upsert))
+
+    def test_mismatched_keys(self):
+        other = Business.objects.create(name='Other Business')
+        result = bulk_upsert(Employee, [
+            {'phone': '4151112222', 'name': 'renamed'},
+            {'phone': '4153334444x5', 'business': other},
+        ])
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual(result.rejected[0].index, 1)
+        self.assertIn('__all__', result.rejected[0].errors)
+        # The rejected row's missing "name" wasn't written as the field default
+        self.assertEqual(Employee.objects.get(phone='4153334444x5').name, 'old 2')
+
+        with self.assertRaises(ValueError):
+            bulk_upsert(Employee, [{'phone': '4151112222', 'name': 'x'}], update_fields=['business'])
+
+    def test_new_rows_missing_required_fields(self):
+        # "business" is only needed to insert, so the other rows still go through
+        for supports_upsert in (True, False):
+            with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', supports_upsert):
+                result = bulk_upsert(Employee, [
+                    {'phone': '(415) 999-0000', 'name': 'new'},
+                    {'phone': '4151112222', 'name': 'renamed'},
+                ])
+            self.assertEqual((result.inserted, result.updated), (0, 1))
+            self.assertEqual([(r.index, r.errors) for r in result.rejected],
+                             [(0, {'business': ['This field cannot be null.']})])
+            self.assertFalse(Employee.objects.filter(phone='4159990000').exists())
+            self.assertEqual(Employee.objects.get(phone='4151112222').name, 'renamed')
+
+        result = bulk_upsert(Employee, [Employee(name='inst', phone='4159990000')])
+        self.assertEqual(list(result.rejected[0].errors), ['business'])
+
+    def test_invalidates_lookup_cache(self):
+        cache.clear()
+        Employee.objects.lookup_cache.invalidate()
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'old 1')
+        bulk_upsert(Employee, [{'name': 'upserted', 'business': self.business, 'phone': '4151112222'}])
+        self.assertEqual(Employee.objects.get_by_phone('4151112222').name, 'upserted')
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        business = Business.objects.create(name='Some Business')
+        Employee.objects.create(name='1', business=business, phone='415 111 2222')
+        Employee.objects.create(name='2', business=business, phone='415.333.4444 x 55')
+        Employee.objects.create(name='3', business=business, phone='+44 (0)20-1234-3000')
+        self.queryset = Employee.objects.order_by('name')
+
+    def test_export_rows(self):
+        rows = list(export_rows(self.queryset, ['name', 'phone', 'business__name'],
+                                phone_attrs=('formatted', 'cleaned', 'is_E164'), chunk_size=2))
+        self.assertEqual(rows, [
+            ('name', 'phone_formatted', 'phone_cleaned', 'phone_is_E164', 'business__name'),
+            ('1', '(415) 111-2222', '+14151112222', True, 'Some Business'),
+            ('2', '(415) 333-4444, press 55', '+14153334444x55', False, 'Some Business'),
+            ('3', '+44 (0)20-1234-3000', '+44 (0)20-1234-3000', False, 'Some Business'),
+        ])
+
+    def test_nullable(self):
+        TestModelBlankNull.objects.create(phone=None)
+        rows = list(export_rows(TestModelBlankNull.objects.all(), ['phone'], phone_attrs=('cleaned', 'is_E164')))
+        self.assertEqual(rows, [('phone_cleaned', 'phone_is_E164'), ('', False)])
+        lines = list(stream_ndjson(TestModelBlankNull.objects.all(), ['phone'], phone_attrs=('is_E164',)))
+        self.assertEqual(lines, ['{"phone_is_E164": false}\n'])
+
+    def test_stream_csv(self):
+        out = ''.join(stream_csv(self.queryset, ['name', 'phone']))
+        self.assertEqual(out.splitlines(), [
+            'name,phone_formatted', '1,(415) 111-2222', '2,"(415) 333-4444, press 55"', '3,+44 (0)20-1234-3000'
+        ])
+
+    def test_stream_ndjson(self):
+        lines = list(stream_ndjson(self.queryset, ['phone'], phone_attrs=('cleaned',)))
+        self.assertEqual(lines[1], '{"phone_cleaned": "+14153334444x55"}\n')
+
+    def test_view(self):
+        view = PhoneExportView.as_view(queryset=self.queryset, fields=['name', 'phone'], filename='employees.csv')
+        response = view(RequestFactory().get('/export/'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 4)
+
+
+class PhoneArrayFieldTest(TestCase):
+    def test_storage_retrieval(self):
+        obj = Contact.objects.create(name='Ted', phones=['(415) 123-4567 x 88', PhoneNumber('415.222.3333'), ''])
+        obj.refresh_from_db()
+        self.assertEqual([p.cleaned for p in obj.phones], ['+14151234567x88', '+14152223333'])
+        self.assertTrue(all(isinstance(p, PhoneNumber) for p in obj.phones))
+
+        empty = Contact.objects.create(name='Empty')
+        empty.refresh_from_db()
+        self.assertEqual(empty.phones, [])
+
+    def test_contains_number(self):
+        ted = Contact.objects.create(name='Ted', phones=['415 123 4567', '415 222 3333 x 5'])
+        Contact.objects.create(name='Bob', phones=['415 123 4568'])
+        Contact.objects.create(name='Odd', phones=['50%_off'])
+        self.assertEqual(list(Contact.objects.filter(phones__contains_number='(415) 123-4567')), [ted])
+        self.assertEqual(list(Contact.objects.filter(phones__contains_number='4152223333x5')), [ted])
+        self.assertFalse(Contact.objects.filter(phones__contains_number='415 222 3333').exists())
+        self.assertFalse(Contact.objects.filter(phones__contains_number='50%').exists())
+        self.assertEqual(Contact.objects.get(phones__contains_number='50%_off').name, 'Odd')
+
+    def test_modelform(self):
+        Form = modelform_factory(Contact, fields=('name', 'phones'))
+        f = Form({'name': 'Ted', 'phones': '415.123.4567\n\n(415) 222-3333, press 2'})
+        self.assertTrue(f.is_valid())
+        obj = f.save()
+        obj.refresh_from_db()
+        self.assertEqual([str(p) for p in obj.phones], ['(415) 123-4567', '(415) 222-3333, press 2'])
+        self.assertIn('(415) 123-4567\n(415) 222-3333, press 2', str(Form(instance=obj)))
+
+
 class ModelTest(TestCase):
     def test_storage_retrieval(self):
         obj = TestModel(phone='(415) 123-4567 x 88')